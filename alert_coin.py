@@ -13,8 +13,12 @@ import time
 import os
 import sys
 import logging
-from datetime import datetime
+import math
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import List, Dict, Tuple, Optional
+from urllib.parse import urlparse, parse_qs
 import json
 from dotenv import load_dotenv
 
@@ -79,6 +83,19 @@ def load_config_from_env() -> Dict:
         if not telegram_chat_id:
             logger.warning("   TELEGRAM_CHAT_ID가 설정되지 않았습니다.")
     
+    # 로컬 스냅샷 조회 API 설정 (선택, 포트가 설정된 경우에만 활성화)
+    snapshot_api_port = os.getenv("SNAPSHOT_API_PORT", "").strip()
+    if snapshot_api_port:
+        try:
+            config["snapshot_api"] = {
+                # 빈 값이면 모든 인터페이스에 바인딩되므로 로컬 주소로 대체
+                "host": os.getenv("SNAPSHOT_API_HOST", "").strip() or "127.0.0.1",
+                "port": int(snapshot_api_port)
+            }
+        except ValueError:
+            logger.error(f"❌ SNAPSHOT_API_PORT가 정수가 아닙니다: {snapshot_api_port}")
+            logger.error("   스냅샷 조회 API 없이 실행합니다.")
+    
     return config
 
 # 기본 설정값 (환경변수가 없을 경우 사용)
@@ -223,17 +240,21 @@ class TechnicalIndicators:
 class OversoldAlertBot:
     """과매도 구간 알림 봇"""
     
-    def __init__(self, config: Dict = None, telegram_notifier: Optional['TelegramNotifier'] = None):
+    def __init__(self, config: Dict = None, telegram_notifier: Optional['TelegramNotifier'] = None,
+                 snapshot_store: Optional['IndicatorSnapshotStore'] = None):
         self.config = config or CONFIG
         self.alert_history = {}  # 알림 중복 방지용
         self.telegram_notifier = telegram_notifier
+        self.snapshot_store = snapshot_store  # 최신 지표 스냅샷 (로컬 조회 API용)
         
-    def get_active_symbols(self) -> List[str]:
-        """활성 심볼 목록 조회 (거래대금 필터 적용)"""
+    def get_active_symbols(self) -> Optional[List[str]]:
+        """활성 심볼 목록 조회 (거래대금 필터 적용, 티커 조회 실패 시 None)"""
         category = self.config['category']
         
-        # 티커 정보 조회
+        # 티커 정보 조회 (API 오류 시 빈 목록이 반환됨)
         tickers = BybitAPI.get_tickers(category)
+        if not tickers:
+            return None
         
         active_symbols = []
         
@@ -256,8 +277,11 @@ class OversoldAlertBot:
         
         return active_symbols
     
-    def analyze_coin(self, symbol: str) -> Dict:
-        """개별 코인 분석 (RSI만 신호 판단, 볼린저밴드는 참고용)"""
+    def analyze_coin(self, symbol: str, snapshots: Optional[Dict] = None) -> Dict:
+        """
+        개별 코인 분석 (RSI만 신호 판단, 볼린저밴드는 참고용)
+        snapshots: 주어지면 신호 여부와 관계없이 지표 스냅샷을 symbol 키로 기록
+        """
         category = self.config['category']
         
         # 4시간봉 데이터 조회 (interval=240)
@@ -306,6 +330,23 @@ class OversoldAlertBot:
             signals.append(f"RSI 과매수 ({latest['rsi']:.1f})")
             signal_type = "overbought"
         
+        # 신호 여부와 관계없이 지표 스냅샷 기록 (스캔 종료 시 한 번에 게시)
+        if snapshots is not None:
+            snapshots[symbol] = {
+                'symbol': symbol,
+                'base_coin': symbol.replace("USDT", ""),
+                'price': latest['close'],
+                'rsi': latest['rsi'],
+                'bb_lower': latest['bb_lower'],
+                'bb_middle': latest['bb_middle'],
+                'bb_upper': latest['bb_upper'],
+                'bb_position': bb_position,
+                'signal_type': signal_type,
+                'datetime': latest['timestamp'].tz_localize('UTC').isoformat(),  # 캔들 시작 시각 (UTC)
+                'change_rate': ((latest['close'] - prev['close']) / prev['close']) * 100 if prev['close'] > 0 else 0,
+                'as_of': datetime.now(timezone.utc).isoformat(timespec='seconds')
+            }
+        
         if not signals:
             return None
         
@@ -408,13 +449,19 @@ class OversoldAlertBot:
         print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 마켓 스캔 시작...")
         
         symbols = self.get_active_symbols()
+        if symbols is None:
+            # 조회 실패 시 기존 스냅샷은 유지하고 다음 스캔에서 재시도
+            logger.warning("티커 조회 실패, 이번 스캔을 건너뜁니다.")
+            return []
         print(f"활성 심볼 수: {len(symbols)}개")
         
         alert_coins = []
+        # 이번 스캔의 지표 스냅샷 (스캔 도중에는 이전 스캔 값을 그대로 제공)
+        snapshots = {} if self.snapshot_store is not None else None
         
         for i, symbol in enumerate(symbols):
             try:
-                result = self.analyze_coin(symbol)
+                result = self.analyze_coin(symbol, snapshots)
                 
                 if result and self.check_alert_cooldown(symbol):
                     alert_coins.append(result)
@@ -443,6 +490,9 @@ class OversoldAlertBot:
                 logger.warning(f"Error analyzing {symbol}: {e}")
                 continue
         
+        if self.snapshot_store is not None:
+            self.snapshot_store.publish(snapshots, symbols)
+        
         return alert_coins
     
     def run(self, single_scan: bool = False):
@@ -599,6 +649,310 @@ class TelegramNotifier:
             return False
 
 
+class IndicatorSnapshotStore:
+    """심볼별 최신 지표 스냅샷 인메모리 인덱스 (스레드 안전)"""
+    
+    # 숫자 필드 (NaN은 JSON 직렬화 시 null로 변환)
+    FLOAT_FIELDS = ('price', 'rsi', 'bb_lower', 'bb_middle', 'bb_upper', 'bb_position', 'change_rate')
+    # 버전별 응답 본문 캐시 최대 개수
+    MAX_CACHED_BODIES = 64
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}       # symbol -> 스냅샷 dict (갱신 시 교체, 수정하지 않음)
+        self._version = 0
+        self._updated_at = None
+        self._boot_id = format(int(time.time()), 'x')  # 재시작 후 ETag 충돌 방지
+        self._by_rsi = None        # RSI 오름차순 정렬 캐시 (버전 변경 시 무효화)
+        self._body_cache = {}      # (format, 쿼리) -> bytes, 현재 버전에 대해서만 유지
+    
+    @staticmethod
+    def _clean_float(value) -> Optional[float]:
+        """numpy/pandas 숫자를 float로 변환 (NaN, inf는 None)"""
+        if value is None:
+            return None
+        value = float(value)
+        return value if math.isfinite(value) else None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._snapshots)
+    
+    def _bump(self):
+        """버전 증가 및 캐시 무효화 (lock 보유 상태에서 호출)"""
+        self._version += 1
+        self._updated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self._by_rsi = None
+        self._body_cache = {}
+    
+    def publish(self, snapshots: Dict[str, Dict], symbols: List[str]):
+        """
+        스캔 결과를 한 번에 게시 (버전은 스캔당 한 번 증가)
+        snapshots: 이번 스캔에서 계산된 심볼별 스냅샷
+        symbols: 이번 스캔의 활성 심볼 (목록에 없는 심볼은 제거,
+                 목록에 있지만 계산에 실패한 심볼은 이전 스냅샷 유지)
+        """
+        records = {}
+        for symbol, snapshot in snapshots.items():
+            record = dict(snapshot)
+            for field in self.FLOAT_FIELDS:
+                record[field] = self._clean_float(record.get(field))
+            records[symbol] = record
+        
+        with self._lock:
+            merged = {
+                symbol: self._snapshots[symbol]
+                for symbol in symbols
+                if symbol in self._snapshots and symbol not in records
+            }
+            merged.update(records)
+            self._snapshots = merged
+            self._bump()
+    
+    def get(self, symbol: str) -> Tuple[str, Optional[Dict]]:
+        """단일 심볼 스냅샷 조회 (ETag, 스냅샷)"""
+        with self._lock:
+            return self._etag(), self._snapshots.get(symbol)
+    
+    def _etag(self) -> str:
+        return f'"{self._boot_id}-{self._version}"'
+    
+    def etag(self) -> str:
+        with self._lock:
+            return self._etag()
+    
+    def _sorted_by_rsi(self) -> List[Dict]:
+        """RSI 오름차순 목록 (RSI 없는 심볼은 뒤쪽, lock 보유 상태에서 호출)"""
+        if self._by_rsi is None:
+            self._by_rsi = sorted(
+                self._snapshots.values(),
+                key=lambda r: (r['rsi'] is None, r['rsi'] or 0, r['symbol'])
+            )
+        return self._by_rsi
+    
+    @staticmethod
+    def _select(records: List[Dict], query: Dict) -> List[Dict]:
+        """필터/정렬/개수 제한 적용"""
+        symbols = query.get('symbols')
+        signal = query.get('signal')
+        rsi_min = query.get('rsi_min')
+        rsi_max = query.get('rsi_max')
+        
+        selected = []
+        for r in records:
+            if symbols and r['symbol'] not in symbols:
+                continue
+            if signal == 'none' and r['signal_type'] is not None:
+                continue
+            if signal in ('oversold', 'overbought') and r['signal_type'] != signal:
+                continue
+            if signal == 'any' and r['signal_type'] is None:
+                continue
+            if rsi_min is not None and (r['rsi'] is None or r['rsi'] < rsi_min):
+                continue
+            if rsi_max is not None and (r['rsi'] is None or r['rsi'] > rsi_max):
+                continue
+            selected.append(r)
+        
+        if query.get('sort') == '-rsi':
+            # RSI 없는 심볼은 내림차순에서도 뒤쪽 유지, 동률은 심볼 오름차순
+            selected.sort(key=lambda r: (r['rsi'] is None, -(r['rsi'] or 0), r['symbol']))
+        elif query.get('sort') != 'rsi':
+            selected.sort(key=lambda r: r['symbol'])
+        
+        limit = query.get('limit')
+        if limit is not None:
+            selected = selected[:limit]
+        return selected
+    
+    def render(self, query: Dict, fmt: str = "json") -> Tuple[str, bytes]:
+        """조회 결과 직렬화 (ETag, 본문). 같은 버전/쿼리는 캐시된 본문 재사용"""
+        cache_key = (fmt, tuple(sorted(
+            (k, tuple(sorted(v)) if isinstance(v, (set, frozenset)) else v)
+            for k, v in query.items()
+        )))
+        
+        with self._lock:
+            etag = self._etag()
+            version = self._version
+            cached = self._body_cache.get(cache_key)
+            if cached is not None:
+                return etag, cached
+            records = self._sorted_by_rsi()
+            updated_at = self._updated_at
+        
+        # 직렬화는 lock 밖에서 수행 (스캔 스레드 차단 방지)
+        selected = self._select(records, query)
+        if fmt == "ndjson":
+            body = "".join(
+                json.dumps(r, ensure_ascii=False, separators=(',', ':')) + "\n" for r in selected
+            ).encode("utf-8")
+        else:
+            body = json.dumps({
+                'version': version,
+                'updated_at': updated_at,
+                'count': len(selected),
+                'data': selected
+            }, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        
+        with self._lock:
+            if self._version == version and len(self._body_cache) < self.MAX_CACHED_BODIES:
+                self._body_cache[cache_key] = body
+        return etag, body
+
+
+class SnapshotRequestHandler(BaseHTTPRequestHandler):
+    """
+    스냅샷 조회 API 핸들러
+    GET /health              : 상태 확인
+    GET /snapshot            : 전체 스냅샷 (symbols, signal, rsi_min, rsi_max, sort, limit, format)
+    GET /snapshot/<SYMBOL>   : 단일 심볼 스냅샷
+    """
+    
+    CONTENT_TYPES = {
+        "json": "application/json; charset=utf-8",
+        "ndjson": "application/x-ndjson; charset=utf-8",
+    }
+    SIGNALS = ("oversold", "overbought", "none", "any")
+    SORTS = ("rsi", "-rsi", "symbol")
+    
+    def log_message(self, format, *args):
+        logger.debug(f"Snapshot API {self.address_string()} - {format % args}")
+    
+    def _send(self, status: int, body: bytes = b"", content_type: str = CONTENT_TYPES["json"],
+              etag: Optional[str] = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304 and body:
+            self.wfile.write(body)
+    
+    def _send_error(self, status: int, message: str):
+        self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode("utf-8"))
+    
+    def _not_modified(self, etag: str) -> bool:
+        """If-None-Match 헤더가 현재 ETag와 일치하면 304 응답"""
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags or f"W/{etag}" in tags:
+            self._send(304, etag=etag)
+            return True
+        return False
+    
+    def _parse_query(self, params: Dict[str, List[str]]) -> Dict:
+        """쿼리 파라미터 검증 (잘못된 값은 ValueError)"""
+        query = {}
+        if params.get('symbols'):
+            symbols = {
+                s.strip().upper()
+                for value in params['symbols'] for s in value.split(",") if s.strip()
+            }
+            if symbols:
+                query['symbols'] = frozenset(symbols)
+        if params.get('signal'):
+            signal = params['signal'][-1].lower()
+            if signal not in self.SIGNALS:
+                raise ValueError(f"signal은 {', '.join(self.SIGNALS)} 중 하나여야 합니다")
+            query['signal'] = signal
+        for key in ('rsi_min', 'rsi_max'):
+            if params.get(key):
+                try:
+                    value = float(params[key][-1])
+                except ValueError:
+                    raise ValueError(f"{key}는 숫자여야 합니다")
+                # nan/inf는 필터가 무시되고 캐시 키도 일치하지 않으므로 거부
+                if not math.isfinite(value):
+                    raise ValueError(f"{key}는 유한한 숫자여야 합니다")
+                query[key] = value
+        if params.get('sort'):
+            sort = params['sort'][-1].lower()
+            if sort not in self.SORTS:
+                raise ValueError(f"sort는 {', '.join(self.SORTS)} 중 하나여야 합니다")
+            query['sort'] = sort
+        if params.get('limit'):
+            try:
+                limit = int(params['limit'][-1])
+            except ValueError:
+                raise ValueError("limit은 정수여야 합니다")
+            if limit < 0:
+                raise ValueError("limit은 0 이상이어야 합니다")
+            query['limit'] = limit
+        return query
+    
+    def do_GET(self):
+        store = self.server.snapshot_store
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/")
+        params = parse_qs(parsed.query)
+        
+        if path == "/health":
+            self._send(200, json.dumps({'status': 'ok', 'symbols': len(store)}).encode("utf-8"))
+            return
+        
+        if path == "/snapshot":
+            fmt = params.get('format', ["json"])[-1].lower()
+            if fmt not in self.CONTENT_TYPES:
+                self._send_error(400, "format은 json 또는 ndjson이어야 합니다")
+                return
+            try:
+                query = self._parse_query(params)
+            except ValueError as e:
+                self._send_error(400, str(e))
+                return
+            # 본문 직렬화 전에 ETag만으로 304 처리
+            if self._not_modified(store.etag()):
+                return
+            etag, body = store.render(query, fmt)
+            self._send(200, body, self.CONTENT_TYPES[fmt], etag=etag)
+            return
+        
+        if path.startswith("/snapshot/"):
+            symbol = path[len("/snapshot/"):].upper()
+            etag, record = store.get(symbol)
+            if record is None:
+                self._send_error(404, f"스냅샷 없음: {symbol}")
+                return
+            if self._not_modified(etag):
+                return
+            body = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+            self._send(200, body, etag=etag)
+            return
+        
+        self._send_error(404, "Not found")
+
+
+class SnapshotAPIServer:
+    """로컬 스냅샷 조회 API 서버 (백그라운드 스레드)"""
+    
+    def __init__(self, snapshot_store: IndicatorSnapshotStore, host: str = "127.0.0.1", port: int = 8080):
+        self.httpd = ThreadingHTTPServer((host, port), SnapshotRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.snapshot_store = snapshot_store
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="snapshot-api", daemon=True)
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+    
+    def start(self):
+        """서버 시작"""
+        self.thread.start()
+        host, port = self.address
+        logger.info(f"✅ 스냅샷 조회 API 시작: http://{host}:{port}/snapshot")
+    
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
 if __name__ == "__main__":
     # 환경변수에서 설정 로드
     config = load_config_from_env()
@@ -654,15 +1008,37 @@ if __name__ == "__main__":
             logger.error("   그룹 Chat ID는 보통 음수입니다 (예: -1001234567890)")
             logger.error("   CloudType 환경변수에서 TELEGRAM_CHAT_ID를 확인하세요.")
     
+    # 로컬 스냅샷 조회 API 설정 (SNAPSHOT_API_PORT가 설정된 경우)
+    snapshot_store = None
+    snapshot_api = None
+    if "snapshot_api" in config:
+        host = config["snapshot_api"]["host"]
+        port = config["snapshot_api"]["port"]
+        try:
+            snapshot_store = IndicatorSnapshotStore()
+            snapshot_api = SnapshotAPIServer(snapshot_store, host=host, port=port)
+            snapshot_api.start()
+        except (OSError, OverflowError) as e:
+            # 부가 기능이므로 실패해도 알림 봇은 계속 실행
+            snapshot_store = None
+            snapshot_api = None
+            logger.error(f"❌ 스냅샷 조회 API 시작 실패 ({host}:{port}): {e}")
+            logger.error("   스냅샷 조회 API 없이 실행합니다.")
+    
     # 봇 인스턴스 생성
-    bot = OversoldAlertBot(config=config, telegram_notifier=telegram_notifier)
+    bot = OversoldAlertBot(config=config, telegram_notifier=telegram_notifier, snapshot_store=snapshot_store)
     
     # 단일 스캔 모드 (환경변수 SINGLE_SCAN=true인 경우)
     single_scan = os.getenv("SINGLE_SCAN", "false").lower() == "true"
     
-    if single_scan:
-        print("🔍 단일 스캔 모드로 실행합니다...")
-        results = bot.run(single_scan=True)
-    else:
-        # 연속 실행
-        bot.run()
\ No newline at end of file
+    try:
+        if single_scan:
+            print("🔍 단일 스캔 모드로 실행합니다...")
+            results = bot.run(single_scan=True)
+        else:
+            # 연속 실행
+            bot.run()
+    finally:
+        # 스냅샷 조회 API 종료
+        if snapshot_api is not None:
+            snapshot_api.stop()
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+스냅샷 조회 API 테스트 (IndicatorSnapshotStore, SnapshotRequestHandler)
+실행: python -m pytest -q
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import alert_coin
+from alert_coin import IndicatorSnapshotStore, OversoldAlertBot, SnapshotAPIServer
+
+
+def make_snapshot(symbol: str, rsi: float, signal_type=None) -> dict:
+    return {
+        'symbol': symbol,
+        'base_coin': symbol.replace("USDT", ""),
+        'price': 100.0,
+        'rsi': rsi,
+        'bb_lower': 90.0,
+        'bb_middle': 100.0,
+        'bb_upper': 110.0,
+        'bb_position': 50.0,
+        'signal_type': signal_type,
+        'datetime': "2026-01-01T00:00:00+00:00",
+        'change_rate': 0.0,
+        'as_of': "2026-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def store():
+    store = IndicatorSnapshotStore()
+    snapshots = {
+        "AUSDT": make_snapshot("AUSDT", 25.0, "oversold"),
+        "BUSDT": make_snapshot("BUSDT", 50.0),
+        "CUSDT": make_snapshot("CUSDT", 50.0),
+        "DUSDT": make_snapshot("DUSDT", float("nan")),
+        "EUSDT": make_snapshot("EUSDT", 75.0, "overbought"),
+    }
+    store.publish(snapshots, list(snapshots))
+    return store
+
+
+@pytest.fixture
+def api(store):
+    server = SnapshotAPIServer(store, port=0)
+    server.start()
+    host, port = server.address
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+def fetch(url: str, headers: dict = None):
+    """(상태 코드, 헤더, 본문) 반환"""
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def symbols_of(body: bytes) -> list:
+    return [r['symbol'] for r in json.loads(body)['data']]
+
+
+# ============================================
+# 쿼리 검증
+# ============================================
+@pytest.mark.parametrize("query", [
+    "signal=bogus",
+    "sort=price",
+    "limit=x",
+    "limit=-1",
+    "rsi_min=abc",
+    "rsi_min=nan",
+    "rsi_max=inf",
+    "format=csv",
+])
+def test_invalid_query_returns_400(api, query):
+    status, _, body = fetch(f"{api}/snapshot?{query}")
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+
+def test_filters(api):
+    _, _, body = fetch(f"{api}/snapshot?signal=any")
+    assert symbols_of(body) == ["AUSDT", "EUSDT"]
+
+    _, _, body = fetch(f"{api}/snapshot?rsi_min=30&rsi_max=60")
+    assert symbols_of(body) == ["BUSDT", "CUSDT"]
+
+    _, _, body = fetch(f"{api}/snapshot?symbols=eusdt,AUSDT")
+    assert symbols_of(body) == ["AUSDT", "EUSDT"]
+
+
+def test_sort_by_rsi(api):
+    _, _, body = fetch(f"{api}/snapshot?sort=rsi")
+    assert symbols_of(body) == ["AUSDT", "BUSDT", "CUSDT", "EUSDT", "DUSDT"]
+
+    # 동률은 심볼 오름차순, RSI 없는 심볼은 뒤쪽
+    _, _, body = fetch(f"{api}/snapshot?sort=-rsi")
+    assert symbols_of(body) == ["EUSDT", "BUSDT", "CUSDT", "AUSDT", "DUSDT"]
+
+    _, _, body = fetch(f"{api}/snapshot?sort=-rsi&limit=2")
+    assert symbols_of(body) == ["EUSDT", "BUSDT"]
+
+
+def test_ndjson(api):
+    status, headers, body = fetch(f"{api}/snapshot?format=ndjson&signal=none")
+    assert status == 200
+    assert headers["Content-Type"].startswith("application/x-ndjson")
+    lines = body.decode("utf-8").splitlines()
+    assert [json.loads(line)['symbol'] for line in lines] == ["BUSDT", "CUSDT", "DUSDT"]
+    assert json.loads(lines[-1])['rsi'] is None
+
+
+def test_single_symbol(api):
+    status, _, body = fetch(f"{api}/snapshot/ausdt")
+    assert status == 200
+    assert json.loads(body)['symbol'] == "AUSDT"
+
+    status, _, _ = fetch(f"{api}/snapshot/XUSDT")
+    assert status == 404
+
+
+# ============================================
+# ETag
+# ============================================
+def test_matching_etag_returns_304(api):
+    for path in ("/snapshot?sort=rsi", "/snapshot/AUSDT"):
+        status, headers, _ = fetch(api + path)
+        assert status == 200
+        etag = headers["ETag"]
+
+        status, _, body = fetch(api + path, {"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+
+
+def test_etag_changes_on_every_publish(api, store):
+    _, headers, first = fetch(f"{api}/snapshot")
+
+    # 값이 같아도 as_of가 바뀌면 본문이 바뀌므로 ETag도 바뀌어야 함
+    snapshot = make_snapshot("AUSDT", 25.0, "oversold")
+    snapshot['as_of'] = "2026-01-01T00:02:00+00:00"
+    store.publish({"AUSDT": snapshot}, ["AUSDT", "BUSDT", "CUSDT", "DUSDT", "EUSDT"])
+
+    status, new_headers, second = fetch(f"{api}/snapshot", {"If-None-Match": headers["ETag"]})
+    assert status == 200
+    assert new_headers["ETag"] != headers["ETag"]
+    assert second != first
+
+
+# ============================================
+# 스캔 게시
+# ============================================
+def test_publish_prunes_inactive_and_keeps_failed(store):
+    previous = store.get("BUSDT")[1]
+    store.publish({"AUSDT": make_snapshot("AUSDT", 20.0, "oversold")}, ["AUSDT", "BUSDT"])
+
+    assert len(store) == 2
+    assert store.get("AUSDT")[1]['rsi'] == 20.0
+    assert store.get("BUSDT")[1] is previous  # 계산 실패 심볼은 이전 값 유지
+    assert store.get("EUSDT")[1] is None      # 비활성 심볼은 제거
+
+
+def test_failed_ticker_fetch_keeps_snapshot(store, monkeypatch):
+    monkeypatch.setattr(alert_coin.BybitAPI, "get_tickers", staticmethod(lambda category: []))
+    etag = store.etag()
+    bot = OversoldAlertBot(dict(alert_coin.CONFIG, rsi_overbought=70), snapshot_store=store)
+
+    assert bot.scan_all_symbols() == []
+    assert len(store) == 5
+    assert store.etag() == etag
+
+
+def test_scan_records_non_signal_symbols(monkeypatch):
+    def fake_kline(symbol, interval="240", limit=100, category="spot"):
+        close = np.linspace(100, 110, limit)
+        return pd.DataFrame({
+            'timestamp': pd.date_range("2026-01-01", periods=limit, freq="4h"),
+            'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': 1.0, 'turnover': 1.0,
+        })
+
+    tickers = [{"symbol": "AUSDT", "turnover24h": "1e9"}, {"symbol": "USDCUSDT", "turnover24h": "1e9"}]
+    monkeypatch.setattr(alert_coin.BybitAPI, "get_tickers", staticmethod(lambda category: tickers))
+    monkeypatch.setattr(alert_coin.BybitAPI, "get_kline", staticmethod(fake_kline))
+    monkeypatch.setattr(alert_coin.time, "sleep", lambda seconds: None)
+
+    store = IndicatorSnapshotStore()
+    # 신호가 발생하지 않는 기준값
+    bot = OversoldAlertBot(dict(alert_coin.CONFIG, rsi_oversold=-1, rsi_overbought=101), snapshot_store=store)
+
+    assert bot.scan_all_symbols() == []
+    record = store.get("AUSDT")[1]
+    assert record['signal_type'] is None
+    assert record['datetime'].endswith("+00:00")
+    assert record['as_of'].endswith("+00:00")
+    assert len(store) == 1